@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 
+from functools import partial
+
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -10,8 +12,11 @@ from homeassistant.const import (CONF_API_KEY, CONF_MODEL, MAJOR_VERSION, MINOR_
 from homeassistant.helpers.storage import Store
 
 from .govee_api import GoveeAPI
+from .key_pool import DeviceOwners, GoveeKeyPool
+from .push import GoveePush
+from .scene_catalog import SceneCatalog
 
-from .const import DOMAIN
+from .const import CONF_API_KEYS, DEVICE_OWNERS, DOMAIN, PUSH, SCENE_CATALOG
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,7 +25,7 @@ PLATFORMS: list[str] = ["light"]
 
 
 class Hub:
-    def __init__(self, api: GoveeAPI | None, address: str = None, devices: list = None) -> None:
+    def __init__(self, api: GoveeKeyPool | None, address: str = None, devices: list = None) -> None:
         """Init Govee dummy hub."""
         self.api = api
         self.devices = devices
@@ -35,7 +40,14 @@ async def async_setup_api(hass: HomeAssistant, config_entry: ConfigEntry) -> boo
 
 async def internal_api_setup(hass: HomeAssistant, entry: ConfigEntry):
     api_key = entry.data.get(CONF_API_KEY)
-    api = GoveeAPI(api_key)
+    api_keys = entry.data.get(CONF_API_KEYS) or [api_key]
+    api = GoveeKeyPool(hass, entry.entry_id, [GoveeAPI(key) for key in api_keys])
+    await api.async_load()
+
+    push: GoveePush = hass.data.setdefault(PUSH, GoveePush(hass))
+    for key in api_keys:
+        push.async_acquire(key)
+        entry.async_on_unload(partial(push.async_release, key))
 
     devices = await api.list_devices()
     _LOGGER.debug(f"Govee devices: %s", devices)
@@ -45,30 +57,26 @@ async def internal_api_setup(hass: HomeAssistant, entry: ConfigEntry):
     await internal_cache_setup(hass, api, entry, devices)
 
 
-UNIQUE_DEVICES = {}
-
-
 async def internal_cache_setup(
-        hass: HomeAssistant, api: GoveeAPI, entry: ConfigEntry, devices: list = None
+        hass: HomeAssistant, api: GoveeKeyPool, entry: ConfigEntry, devices: list = None
 ):
     if devices is None:
         store = Store(hass, 1, f"{DOMAIN}/{entry.data.get(CONF_API_KEY)}.json")
         devices = await store.async_load()
         if devices:
             _LOGGER.debug(f"{len(devices)} devices loaded from cache!")
+    if devices:
+        devices = await internal_unique_devices(hass, entry.entry_id, devices)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = Hub(api, devices=devices)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
 
-def internal_unique_devices(uid: str, devices: list) -> list:
+async def internal_unique_devices(hass: HomeAssistant, uid: str, devices: list) -> list:
     """For support multiple integrations - bind each device to one integraion.
     To avoid duplicates.
     """
-    return [
-        device
-        for device in devices
-        if UNIQUE_DEVICES.setdefault(device["device"], uid) == uid
-    ]
+    owners: DeviceOwners = hass.data.setdefault(DEVICE_OWNERS, DeviceOwners(hass))
+    return await owners.async_claim(uid, devices)
 
 
 async def async_setup_ble(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -81,6 +89,11 @@ async def async_setup_ble(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             f"Could not find Govee BLE device with address {address}"
         )
 
+    model = entry.data.get(CONF_MODEL)
+    catalog: SceneCatalog = hass.data.setdefault(SCENE_CATALOG, SceneCatalog(hass))
+    await catalog.async_load(model)
+    entry.async_on_unload(catalog.async_register(model))
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = Hub(None, address=address)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -99,6 +112,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Hand the devices of a removed entry over to the remaining ones."""
+    owners: DeviceOwners = hass.data.setdefault(DEVICE_OWNERS, DeviceOwners(hass))
+    await owners.async_release(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -13,8 +13,9 @@ from homeassistant.config_entries import ConfigFlow
 from homeassistant.const import (CONF_ADDRESS, CONF_MODEL, CONF_API_KEY, CONF_TYPE)
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_TYPE_API, CONF_TYPE_BLE
+from .const import DOMAIN, CONF_TYPE_API, CONF_TYPE_BLE, CONF_API_KEYS
 from pathlib import Path
+import re
 
 class GoveeConfigFlow(ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -81,13 +82,17 @@ class GoveeConfigFlow(ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None and CONF_API_KEY in user_input and user_input[CONF_API_KEY] is not None:
-            api_key = user_input[CONF_API_KEY]
-            return self.async_create_entry(
-                title='Govee API',
-                data={
-                    CONF_API_KEY: api_key
-                }
-            )
+            # Several keys can be pooled in one entry, separated by commas or spaces
+            api_keys = [key for key in re.split(r"[\s,;]+", user_input[CONF_API_KEY]) if key]
+            if api_keys:
+                return self.async_create_entry(
+                    title='Govee API',
+                    data={
+                        CONF_API_KEY: api_keys[0],
+                        CONF_API_KEYS: api_keys
+                    }
+                )
+            errors[CONF_API_KEY] = 'invalid_api_key'
 
         return self.async_show_form(
             step_id="api",
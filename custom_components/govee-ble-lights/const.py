@@ -1,3 +1,13 @@
 DOMAIN = "govee-ble-lights"
 CONF_TYPE_API = 'API'
 CONF_TYPE_BLE = 'BLE'
+CONF_API_KEYS = 'api_keys'
+SCENE_CATALOG = f"{DOMAIN}_scene_catalog"
+SIGNAL_SCENE_CATALOG_UPDATED = f"{DOMAIN}_scene_catalog_updated"
+DEVICE_OWNERS = f"{DOMAIN}_device_owners"
+HYBRID_LINKS = f"{DOMAIN}_hybrid_links"
+SIGNAL_HYBRID_LINK = f"{DOMAIN}_hybrid_link"
+PUSH = f"{DOMAIN}_push"
+SIGNAL_PUSH_STATE = f"{DOMAIN}_push_state"
+BLE_CLAIMS = f"{DOMAIN}_ble_claims"
+SIGNAL_BLE_CLAIM = f"{DOMAIN}_ble_claim"
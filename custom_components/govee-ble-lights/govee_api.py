@@ -1,26 +1,112 @@
 import requests
 import asyncio
+import time
 
 import uuid
 
+# Govee allows 10000 requests per day for each API key and 10 per minute for each device
+DAILY_REQUEST_LIMIT = 10000
+DEVICE_REQUESTS_PER_MINUTE = 10
+RATE_LIMIT_REMAINING_HEADERS = ("API-RateLimit-Remaining", "X-RateLimit-Remaining")
+RATE_LIMIT_RESET_HEADERS = ("API-RateLimit-Reset", "X-RateLimit-Reset")
+# Backoff after a 429 that says nothing about when to retry; Govee also sends
+# 429 for its per-device limit
+RATE_LIMIT_BACKOFF = 60.0
+
+
+def parse_device_state(state: dict) -> dict:
+    """Map a cloud device state to light attributes."""
+    result = {}
+    for cap in state["capabilities"]:
+        # Event capabilities carry a list of events instead of a value
+        if not isinstance(cap.get('state'), dict) or 'value' not in cap['state']:
+            continue
+        if cap['instance'] == 'powerSwitch':
+            result['is_on'] = cap['state']['value'] == 1
+        if cap['instance'] == 'brightness':
+            result['brightness'] = round(cap['state']['value'] / 100 * 255)
+        if cap['instance'] == 'colorTemperatureK':
+            value = cap['state']['value']
+            if value != 0:
+                result['color_temp_kelvin'] = value
+        if cap['instance'] == 'colorRgb':
+            num = cap['state']['value']
+            result['rgb_color'] = ((num >> 16) & 0xFF, (num >> 8) & 0xFF, num & 0xFF)
+    return result
+
+
+class GoveeRateLimited(Exception):
+    """The API key has used up its request budget."""
+
+    def __init__(self, api_key: str, retry_at: float):
+        super().__init__(f"Govee API key rate limited until {retry_at}")
+        self.api_key = api_key
+        self.retry_at = retry_at
+
 
 class GoveeAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, base_url: str = "https://openapi.api.govee.com/router/api/v1"):
         self.api_key = api_key
-        self.base_url = "https://openapi.api.govee.com/router/api/v1"
+        self.base_url = base_url
         self.headers = {
             "Govee-API-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        self.remaining = DAILY_REQUEST_LIMIT
+        self.reset_at = time.time() + 86400
+        self.throttled_until = 0.0
+
+    @property
+    def throttled(self) -> bool:
+        return time.time() < self.throttled_until
+
+    @property
+    def budget(self) -> int:
+        """Requests left before the key is throttled."""
+        if self.throttled:
+            return 0
+        if time.time() >= self.reset_at:
+            self.remaining = DAILY_REQUEST_LIMIT
+            self.reset_at = time.time() + 86400
+        return self.remaining
+
+    def _track(self, response: requests.Response) -> requests.Response:
+        self.remaining = max(0, self.budget - 1)
+        for header in RATE_LIMIT_REMAINING_HEADERS:
+            if header in response.headers:
+                self.remaining = int(response.headers[header])
+        reset_at = None
+        for header in RATE_LIMIT_RESET_HEADERS:
+            if header in response.headers:
+                reset = float(response.headers[header])
+                # Either an epoch timestamp or seconds until the window resets
+                self.reset_at = reset_at = reset if reset > 1e9 else time.time() + reset
+
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                self.throttled_until = time.time() + float(retry_after)
+            elif reset_at is not None:
+                self.throttled_until = reset_at
+            else:
+                self.throttled_until = time.time() + RATE_LIMIT_BACKOFF
+            raise GoveeRateLimited(self.api_key, self.throttled_until)
+        return response
+
+    async def _get(self, url):
+        return self._track(await asyncio.to_thread(requests.get, url, headers=self.headers))
+
+    async def _post(self, url, json):
+        return self._track(await asyncio.to_thread(requests.post, url, headers=self.headers, json=json))
 
     async def list_devices(self):
         url = f"{self.base_url}/user/devices"
-        response = await asyncio.to_thread(requests.get, url, headers=self.headers)
+        response = await self._get(url)
         return response.json()['data']
 
     async def list_scenes(self, sku: str, device: str):
         url = f"{self.base_url}/device/scenes"
-        response = await asyncio.to_thread(requests.post, url, headers=self.headers, json={
+        response = await self._post(url, {
             'requestId': uuid.uuid4().hex,
             'payload': {
                 'sku': sku,
@@ -31,7 +117,7 @@ class GoveeAPI:
 
     async def toggle_power(self, sku: str, device: str, value: int):
         url = f"{self.base_url}/device/control"
-        response = await asyncio.to_thread(requests.post, url, headers=self.headers, json={
+        response = await self._post(url, {
             'requestId': uuid.uuid4().hex,
             'payload': {
                 'sku': sku,
@@ -47,7 +133,7 @@ class GoveeAPI:
 
     async def get_device_state(self, sku: str, device: str):
         url = f"{self.base_url}/device/state"
-        response = await asyncio.to_thread(requests.post, url, headers=self.headers, json={
+        response = await self._post(url, {
             'requestId': uuid.uuid4().hex,
             'payload': {
                 'sku': sku,
@@ -58,7 +144,7 @@ class GoveeAPI:
 
     async def set_color_rgb(self, sku: str, device: str, r: int, g: int, b: int):
         url = f"{self.base_url}/device/control"
-        response = await asyncio.to_thread(requests.post, url, headers=self.headers, json={
+        response = await self._post(url, {
             'requestId': uuid.uuid4().hex,
             'payload': {
                 'sku': sku,
@@ -74,7 +160,7 @@ class GoveeAPI:
 
     async def set_color_temp(self, sku: str, device: str, kelvin: int):
         url = f"{self.base_url}/device/control"
-        response = await asyncio.to_thread(requests.post, url, headers=self.headers, json={
+        response = await self._post(url, {
             'requestId': uuid.uuid4().hex,
             'payload': {
                 'sku': sku,
@@ -90,7 +176,7 @@ class GoveeAPI:
 
     async def set_brightness(self, sku: str, device: str, value: int):
         url = f"{self.base_url}/device/control"
-        response = await asyncio.to_thread(requests.post, url, headers=self.headers, json={
+        response = await self._post(url, {
             'requestId': uuid.uuid4().hex,
             'payload': {
                 'sku': sku,
@@ -106,7 +192,7 @@ class GoveeAPI:
 
     async def set_scene(self, sku: str, device: str, value: object):
         url = f"{self.base_url}/device/control"
-        response = await asyncio.to_thread(requests.post, url, headers=self.headers, json={
+        response = await self._post(url, {
             'requestId': uuid.uuid4().hex,
             'payload': {
                 'sku': sku,
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .govee_api import GoveeAPI, GoveeRateLimited
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceOwners:
+    """Binds each cloud device to exactly one config entry.
+
+    Claims are stored, so the same entry keeps a device across reloads and
+    restarts no matter in which order entries are set up. A device moves when
+    the entry that owns it is gone, disabled or failed to set up.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store = Store(hass, 1, f"{DOMAIN}/device_owners.json")
+        self._owners: dict[str, str] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_claim(self, entry_id: str, devices: list) -> list:
+        """Return the devices owned by entry_id, claiming any that are unowned."""
+        async with self._lock:
+            if self._owners is None:
+                self._owners = await self._store.async_load() or {}
+
+            changed = False
+            claimed = []
+            for device in devices:
+                owner = self._owners.get(device["device"])
+                if owner != entry_id and not self._active(owner):
+                    self._owners[device["device"]] = owner = entry_id
+                    changed = True
+                if owner == entry_id:
+                    claimed.append(device)
+
+            if changed:
+                await self._store.async_save(self._owners)
+            return claimed
+
+    async def async_release(self, entry_id: str) -> None:
+        """Drop all claims of a removed entry."""
+        async with self._lock:
+            if self._owners is None:
+                self._owners = await self._store.async_load() or {}
+
+            released = [device for device, owner in self._owners.items() if owner == entry_id]
+            for device in released:
+                del self._owners[device]
+            if released:
+                await self._store.async_save(self._owners)
+
+    def _active(self, entry_id: str | None) -> bool:
+        entry = self.hass.config_entries.async_get_entry(entry_id) if entry_id is not None else None
+        return (entry is not None and entry.disabled_by is None
+                and entry.state in (ConfigEntryState.LOADED, ConfigEntryState.SETUP_IN_PROGRESS))
+
+
+class GoveeKeyPool:
+    """Spreads the cloud traffic of one config entry over several API keys.
+
+    Every device gets an owner key that carries its polling; owners are spread
+    by the number of devices per key and stored per entry. Control commands go
+    to whichever key that can see the device has the most budget left. A
+    throttled key hands its devices over to the others and gets its share back
+    once it recovers.
+
+    The pool exposes the device methods of GoveeAPI, so entities use it as is.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, apis: list[GoveeAPI]) -> None:
+        self.apis = {api.api_key: api for api in apis}
+        self._candidates: dict[str, list[str]] = {}
+        self._owners: dict[str, str] = {}
+        self._throttled: set[str] = set()
+        self._store = Store(hass, 1, f"{DOMAIN}/key_pool_{entry_id}.json")
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        self._owners = {device: key for device, key in stored.items() if key in self.apis}
+
+    async def list_devices(self) -> list:
+        """List devices of all keys, once per device."""
+        devices = {}
+        self._candidates = {}
+        error: Exception | None = None
+        listed_any = False
+        for api in self.apis.values():
+            try:
+                listed = await api.list_devices()
+            except Exception as err:
+                _LOGGER.warning("Failed to list devices for a Govee API key", exc_info=True)
+                error = err
+                # Keep what this key owned, it is probably still visible to it
+                for device, key in self._owners.items():
+                    if key == api.api_key:
+                        self._candidates.setdefault(device, []).append(key)
+                continue
+
+            listed_any = True
+            for device in listed:
+                devices.setdefault(device["device"], device)
+                self._candidates.setdefault(device["device"], []).append(api.api_key)
+
+        if not listed_any and error is not None:
+            # Let setup fail and keep the cached device list rather than overwrite it with nothing
+            raise error
+
+        await self.async_rebalance()
+        return list(devices.values())
+
+    def _load(self) -> dict[str, int]:
+        load = {key: 0 for key in self.apis}
+        for device, key in self._owners.items():
+            if device in self._candidates:
+                load[key] += 1
+        return load
+
+    async def async_rebalance(self) -> None:
+        """Move devices to the least loaded usable key that sees them.
+
+        Devices without a usable owner key always move, others only when their
+        owner carries at least two devices more than the least loaded key.
+        """
+        load = self._load()
+        changed = False
+        for device in sorted(self._candidates):
+            keys = self._candidates[device]
+            owner = self._owners.get(device)
+            usable = [key for key in keys if not self.apis[key].throttled] or keys
+            new_owner = min(usable, key=lambda key: (load[key], -self.apis[key].budget))
+            if new_owner == owner or (owner in usable and load[owner] - load[new_owner] <= 1):
+                continue
+
+            if owner in load:
+                load[owner] -= 1
+            load[new_owner] += 1
+            self._owners[device] = new_owner
+            changed = True
+            _LOGGER.debug("Device %s moved to another Govee API key", device)
+
+        self._throttled = {key for key, api in self.apis.items() if api.throttled}
+        if changed:
+            await self._store.async_save(self._owners)
+
+    def _keys_for(self, device: str, control: bool) -> list[str]:
+        keys = self._candidates.get(device) or list(self.apis)
+        if control:
+            return sorted(keys, key=lambda key: -self.apis[key].budget)
+
+        owner = self._owners.get(device)
+        return sorted(keys, key=lambda key: key != owner)
+
+    async def _call(self, device: str, control: bool, method: str, *args):
+        if any(not self.apis[key].throttled for key in self._throttled):
+            _LOGGER.debug("Govee API key recovered, rebalancing devices")
+            await self.async_rebalance()
+
+        keys = self._keys_for(device, control)
+        for key in keys:
+            api = self.apis[key]
+            if api.throttled and key != keys[-1]:
+                continue
+            try:
+                return await getattr(api, method)(*args)
+            except GoveeRateLimited:
+                _LOGGER.info("Govee API key throttled, rebalancing devices")
+                await self.async_rebalance()
+        raise GoveeRateLimited(keys[-1], min(self.apis[key].throttled_until for key in keys))
+
+    async def list_scenes(self, sku: str, device: str):
+        return await self._call(device, False, "list_scenes", sku, device)
+
+    async def get_device_state(self, sku: str, device: str):
+        return await self._call(device, False, "get_device_state", sku, device)
+
+    async def toggle_power(self, sku: str, device: str, value: int):
+        return await self._call(device, True, "toggle_power", sku, device, value)
+
+    async def set_color_rgb(self, sku: str, device: str, r: int, g: int, b: int):
+        return await self._call(device, True, "set_color_rgb", sku, device, r, g, b)
+
+    async def set_color_temp(self, sku: str, device: str, kelvin: int):
+        return await self._call(device, True, "set_color_temp", sku, device, kelvin)
+
+    async def set_brightness(self, sku: str, device: str, value: int):
+        return await self._call(device, True, "set_brightness", sku, device, value)
+
+    async def set_scene(self, sku: str, device: str, value: object):
+        return await self._call(device, True, "set_scene", sku, device, value)
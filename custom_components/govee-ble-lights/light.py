@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import array
 import logging
-import re
+import time
 
 from enum import IntEnum
 import bleak_retry_connector
@@ -10,29 +10,41 @@ import bleak_retry_connector
 from bleak import BleakClient
 from homeassistant.components import bluetooth
 from homeassistant.components.light import (ATTR_BRIGHTNESS, ATTR_RGB_COLOR, ATTR_EFFECT, ColorMode, LightEntity,
-                                            LightEntityFeature, ATTR_COLOR_TEMP_KELVIN)
+                                            LightEntityFeature, ATTR_COLOR_TEMP_KELVIN, ATTR_TRANSITION)
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.storage import Store
 import homeassistant.util.color as color_util
 
-from .const import DOMAIN
-from pathlib import Path
-import json
+from .const import (BLE_CLAIMS, DOMAIN, HYBRID_LINKS, PUSH, SCENE_CATALOG, SIGNAL_BLE_CLAIM, SIGNAL_HYBRID_LINK,
+                    SIGNAL_PUSH_STATE, SIGNAL_SCENE_CATALOG_UPDATED)
+from .govee_api import DEVICE_REQUESTS_PER_MINUTE, parse_device_state
 from .govee_utils import prepareMultiplePacketsData
 import base64
 from . import Hub
+from .key_pool import GoveeKeyPool
+from .push import GoveePush
+from .scene_catalog import SceneCatalog
+from .transition import LightFrame, TransitionEngine
+from .transport import TRANSPORT_API, TRANSPORT_BLE, HybridRouter, ble_address
+from dataclasses import replace
 from datetime import timedelta
+from functools import partial
 
 SCAN_INTERVAL = timedelta(seconds=30)
 
-
 _LOGGER = logging.getLogger(__name__)
 
 UUID_CONTROL_CHARACTERISTIC = '00010203-0405-0607-0809-0a0b0c0d2b11'
-EFFECT_PARSE = re.compile("\[(\d+)/(\d+)/(\d+)/(\d+)]")
 SEGMENTED_MODELS = ['H6053', 'H6072', 'H6102', 'H6199']
+# Shortest pause between transition frames: BLE writes, and cloud requests at 80% of
+# the per-device budget so a fade leaves room for other requests to the device
+BLE_FRAME_INTERVAL = 0.1
+API_REQUEST_INTERVAL = 60 / (DEVICE_REQUESTS_PER_MINUTE * 0.8)
 
 class LedCommand(IntEnum):
     """ A control command packet's type. """
@@ -61,13 +73,86 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
 
     if hub.devices is not None:
         devices = hub.devices
+        # Lights with a BLE entity get a single hybrid entity from their BLE entry;
+        # the cloud entity only exists while no BLE entity claims the address
+        links = hass.data.setdefault(HYBRID_LINKS, {})
+        claims = hass.data.setdefault(BLE_CLAIMS, set())
+        cloud_devices: dict[str, dict] = {}
+        entities: dict[str, GoveeAPILight] = {}
+
+        @callback
+        def _add_cloud_entity(address: str) -> None:
+            _LOGGER.info("Adding device: %s", cloud_devices[address])
+            entities[address] = GoveeAPILight(hub, cloud_devices[address])
+            async_add_entities([entities[address]])
+
+        @callback
+        def _ble_claim(address: str, claimed: bool) -> None:
+            if address not in cloud_devices:
+                return
+            if claimed and address in entities:
+                _LOGGER.info("Linking device to its BLE entry: %s", cloud_devices[address])
+                # An entity still waiting to be added removes itself once added
+                _remove_cloud_entity(hass, cloud_devices[address]['device'], entities.pop(address))
+            elif not claimed and address not in entities:
+                _add_cloud_entity(address)
+
         for device in devices:
             if device['type'] == 'devices.types.light':
-                _LOGGER.info("Adding device: %s", device)
-                async_add_entities([GoveeAPILight(hub, device)])
+                address = ble_address(device['device'])
+                cloud_devices[address] = device
+                links[address] = (hub.api, device)
+                async_dispatcher_send(hass, SIGNAL_HYBRID_LINK, address)
+                config_entry.async_on_unload(partial(_unlink_device, hass, address))
+
+                if address in claims:
+                    _LOGGER.info("Linking device to its BLE entry: %s", device)
+                    _remove_cloud_entity(hass, device['device'])
+                else:
+                    _add_cloud_entity(address)
+
+        config_entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_BLE_CLAIM, _ble_claim))
     elif hub.address is not None:
         ble_device = bluetooth.async_ble_device_from_address(hass, hub.address.upper(), False)
-        async_add_entities([GoveeBluetoothLight(hub, ble_device, config_entry)])
+        async_add_entities([GoveeBluetoothLight(hub, ble_device, config_entry, hass.data[SCENE_CATALOG])])
+
+
+@callback
+def _unlink_device(hass: HomeAssistant, address: str) -> None:
+    hass.data.get(HYBRID_LINKS, {}).pop(address, None)
+    async_dispatcher_send(hass, SIGNAL_HYBRID_LINK, address)
+
+
+@callback
+def _remove_cloud_entity(hass: HomeAssistant, unique_id: str, entity: GoveeAPILight | None = None) -> None:
+    """Remove a cloud entity with its registry entry, so no orphan is left behind after a restart."""
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id("light", DOMAIN, unique_id)
+    if entity_id is not None:
+        # The entity removes itself from the state machine along with its registry entry
+        registry.async_remove(entity_id)
+    elif entity is not None and entity.hass is not None:
+        hass.async_create_task(entity.async_remove())
+
+
+def _should_poll_cloud(hass: HomeAssistant, api: GoveeKeyPool, device: str, last_poll: float | None) -> bool:
+    """Poll once for the initial state, then on every update unless a push
+    stream of the entry's keys is actually delivering this device's state.
+    """
+    if last_poll is None:
+        return True
+    push: GoveePush | None = hass.data.get(PUSH)
+    return push is None or not push.streaming(api.apis, device)
+
+
+def _api_brightness(brightness: int) -> int:
+    """Govee API brightness is a percentage in 1-100."""
+    return max(1, round(brightness / 255 * 100))
+
+
+def _check_response(response: dict) -> None:
+    if response.get('code', 200) != 200:
+        raise HomeAssistantError(f"Govee API command failed: {response.get('msg')}")
 
 
 class GoveeAPILight(LightEntity, dict):
@@ -119,26 +204,48 @@ class GoveeAPILight(LightEntity, dict):
 
         self._state = None
         self._brightness = None
+        self._output_brightness = None
+        self._transition = TransitionEngine(self._send_frame, API_REQUEST_INTERVAL)
+        self._last_command = 0.0
+        self._last_poll: float | None = None
         self.update_scenes()
 
+    async def async_added_to_hass(self) -> None:
+        if ble_address(self.device) in self.hass.data.get(BLE_CLAIMS, ()):
+            # Claimed by a BLE entity while this one was being added
+            _remove_cloud_entity(self.hass, self.device, self)
+            return
+
+        @callback
+        def _push_state(device: str, state: dict) -> None:
+            if device == self.device and not self._transition.running:
+                self._apply_state(state)
+                self.async_write_ha_state()
+
+        self.async_on_remove(async_dispatcher_connect(self.hass, SIGNAL_PUSH_STATE, _push_state))
+
     async def async_update(self):
-        """Retrieve latest state."""
+        """Retrieve latest state unless a transition runs or a command was sent since the request started."""
+        if self._transition.running or not _should_poll_cloud(self.hass, self.hub.api, self.device, self._last_poll):
+            return
         _LOGGER.info("Updating device: %s", self.device_data)
 
-        state = await self.hub.api.get_device_state(self.sku, self.device)
-        for cap in state["capabilities"]:
-            if cap['instance'] == 'powerSwitch':
-                self._state = cap['state']['value'] == 1
-            if cap['instance'] == 'brightness':
-                self._brightness = cap['state']['value']
-            if cap['instance'] == 'colorTemperatureK':
-                value = cap['state']['value']
-                if value != 0:
-                    self._attr_color_temp_kelvin = value
-                    self._attr_color_temp = color_util.color_temperature_kelvin_to_mired(value)
-            if cap['instance'] == 'colorRgb':
-                num = cap['state']['value']
-                self._attr_rgb_color = ((num >> 16) & 0xFF, (num >> 8) & 0xFF, num & 0xFF)
+        started = self._last_poll = time.monotonic()
+        state = parse_device_state(await self.hub.api.get_device_state(self.sku, self.device))
+        if started < self._last_command or self._transition.running:
+            return
+        self._apply_state(state)
+
+    def _apply_state(self, state: dict) -> None:
+        if 'is_on' in state:
+            self._state = state['is_on']
+        if 'brightness' in state:
+            self._brightness = self._output_brightness = state['brightness']
+        if 'color_temp_kelvin' in state:
+            self._attr_color_temp_kelvin = state['color_temp_kelvin']
+            self._attr_color_temp = color_util.color_temperature_kelvin_to_mired(state['color_temp_kelvin'])
+        if 'rgb_color' in state:
+            self._attr_rgb_color = state['rgb_color']
 
     async def update_scenes(self):
         if LightEntityFeature.EFFECT in self.supported_features:
@@ -169,20 +276,44 @@ class GoveeAPILight(LightEntity, dict):
         return self._state
 
     async def async_turn_on(self, **kwargs) -> None:
+        await self._transition.async_cancel()
+        self._last_command = time.monotonic()
+        was_on = self._state
         self._state = True
 
-        if ATTR_BRIGHTNESS in kwargs:
-            brightness = kwargs.get(ATTR_BRIGHTNESS, 255)
-            await self.hub.api.set_brightness(self.sku, self.device, (brightness / 255) * 100)
-            self._brightness = brightness
+        target = LightFrame(
+            brightness=kwargs.get(ATTR_BRIGHTNESS),
+            rgb_color=kwargs.get(ATTR_RGB_COLOR),
+            color_temp_kelvin=kwargs.get(ATTR_COLOR_TEMP_KELVIN),
+        )
+        transition = kwargs.get(ATTR_TRANSITION)
+        min_interval = 0.0
+        if transition and ATTR_EFFECT not in kwargs and (target != LightFrame() or not was_on):
+            if target.brightness is None:
+                target = replace(target, brightness=self._brightness or 255)
+            min_interval = API_REQUEST_INTERVAL * self._frame_requests(target)
+
+        if transition and ATTR_EFFECT not in kwargs and target.brightness is not None and transition > min_interval:
+            start = LightFrame(
+                brightness=self._output_brightness if was_on else 1,
+                rgb_color=self._attr_rgb_color,
+                color_temp_kelvin=self._attr_color_temp_kelvin,
+            )
+            self._update_target(target)
+
+            if not was_on:
+                # Dim first so the light does not flash at its previous brightness
+                await self._send_frame(LightFrame(brightness=start.brightness))
+                _check_response(await self.hub.api.toggle_power(self.sku, self.device, 1))
+            await self._transition.async_start(self.hass, start, target, transition, min_interval=min_interval)
+            return
 
-        if ATTR_RGB_COLOR in kwargs:
-            red, green, blue = kwargs.get(ATTR_RGB_COLOR)
-            await self.hub.api.set_color_rgb(self.sku, self.device, red, green, blue)
+        if target.brightness is None and self._brightness is not None and self._output_brightness != self._brightness:
+            # A faded out light is left dimmed, bring it back to the remembered level
+            target = replace(target, brightness=self._brightness)
 
-        if ATTR_COLOR_TEMP_KELVIN in kwargs:
-            kelvin = kwargs.get(ATTR_COLOR_TEMP_KELVIN)
-            await self.hub.api.set_color_temp(self.sku, self.device, kelvin)
+        self._update_target(target)
+        await self._send_frame(target)
 
         if ATTR_EFFECT in kwargs:
             effect_name = kwargs.get(ATTR_EFFECT)
@@ -198,9 +329,50 @@ class GoveeAPILight(LightEntity, dict):
         await self.hub.api.toggle_power(self.sku, self.device, 1)
 
     async def async_turn_off(self, **kwargs) -> None:
+        await self._transition.async_cancel()
+        self._last_command = time.monotonic()
+
+        transition = kwargs.get(ATTR_TRANSITION)
+        brightness = self._output_brightness if self._output_brightness is not None else self._brightness
+        if transition and transition > API_REQUEST_INTERVAL and self._state and brightness:
+            self._state = False
+            await self._transition.async_start(
+                self.hass, LightFrame(brightness=brightness), LightFrame(brightness=0), transition,
+                after=lambda: self.hub.api.toggle_power(self.sku, self.device, 0),
+                min_interval=API_REQUEST_INTERVAL
+            )
+            return
+
         await self.hub.api.toggle_power(self.sku, self.device, 0)
         self._state = False
 
+    async def async_will_remove_from_hass(self) -> None:
+        await self._transition.async_cancel()
+
+    def _update_target(self, target: LightFrame) -> None:
+        if target.brightness is not None:
+            self._brightness = target.brightness
+        if target.rgb_color is not None:
+            self._attr_rgb_color = target.rgb_color
+        if target.color_temp_kelvin is not None:
+            self._attr_color_temp_kelvin = target.color_temp_kelvin
+
+    @staticmethod
+    def _frame_requests(frame: LightFrame) -> int:
+        return max(1, sum(value is not None for value in (frame.brightness, frame.rgb_color, frame.color_temp_kelvin)))
+
+    async def _send_frame(self, frame: LightFrame) -> None:
+        if frame.brightness is not None:
+            _check_response(await self.hub.api.set_brightness(self.sku, self.device, _api_brightness(frame.brightness)))
+            self._output_brightness = frame.brightness
+
+        if frame.rgb_color is not None:
+            red, green, blue = frame.rgb_color
+            _check_response(await self.hub.api.set_color_rgb(self.sku, self.device, red, green, blue))
+
+        if frame.color_temp_kelvin is not None:
+            _check_response(await self.hub.api.set_color_temp(self.sku, self.device, frame.color_temp_kelvin))
+
 
 class GoveeBluetoothLight(LightEntity):
     _attr_color_mode = ColorMode.RGB
@@ -208,32 +380,94 @@ class GoveeBluetoothLight(LightEntity):
     _attr_supported_features = LightEntityFeature(
         LightEntityFeature.EFFECT | LightEntityFeature.FLASH | LightEntityFeature.TRANSITION)
 
-    def __init__(self, hub: Hub, ble_device, config_entry: ConfigEntry) -> None:
+    def __init__(self, hub: Hub, ble_device, config_entry: ConfigEntry, catalog: SceneCatalog) -> None:
         """Initialize an bluetooth light."""
         self._mac = hub.address
         self._model = config_entry.data["model"]
         self._is_segmented = self._model in SEGMENTED_MODELS
         self._ble_device = ble_device
+        self._catalog = catalog
         self._state = None
         self._brightness = None
+        self._output_brightness = None
+        self._attr_rgb_color = None
+        self._transition = TransitionEngine(self._sendFrame, BLE_FRAME_INTERVAL)
+        self._router = HybridRouter()
+        self._cloud: tuple | None = None
+        self._last_command = 0.0
+        self._last_poll: float | None = None
 
     @property
     def effect_list(self) -> list[str] | None:
-        effect_list = []
-        json_data = json.loads(Path(Path(__file__).parent / "jsons" / (self._model + ".json")).read_text())
-        for categoryIdx, category in enumerate(json_data['data']['categories']):
-            for sceneIdx, scene in enumerate(category['scenes']):
-                for leffectIdx, lightEffect in enumerate(scene['lightEffects']):
-                    for seffectIxd, specialEffect in enumerate(lightEffect['specialEffect']):
-                        # if 'supportSku' not in specialEffect or self._model in specialEffect['supportSku']:
-                        # Workaround cause we need to store some metadata in effect (effect names not unique)
-                        indexes = str(categoryIdx) + "/" + str(sceneIdx) + "/" + str(leffectIdx) + "/" + str(
-                            seffectIxd)
-                        effect_list.append(
-                            category['categoryName'] + " - " + scene['sceneName'] + ' - ' + lightEffect[
-                                'scenceName'] + " [" + indexes + "]")
-
-        return effect_list
+        index = self._catalog.get(self._model)
+        return index.effect_list if index is not None else []
+
+    async def async_added_to_hass(self) -> None:
+        @callback
+        def _catalog_updated(model: str) -> None:
+            if model == self._model:
+                self.async_write_ha_state()
+
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, SIGNAL_SCENE_CATALOG_UPDATED, _catalog_updated)
+        )
+
+        @callback
+        def _link_updated(address: str) -> None:
+            if address == self._mac.upper():
+                self._cloud = self.hass.data.get(HYBRID_LINKS, {}).get(address)
+                _LOGGER.debug("Cloud link for %s: %s", address, self._cloud is not None)
+
+        self.async_on_remove(async_dispatcher_connect(self.hass, SIGNAL_HYBRID_LINK, _link_updated))
+        _link_updated(self._mac.upper())
+
+        # Claim the light so an API entry hands it over instead of adding its own entity
+        address = self._mac.upper()
+        claims = self.hass.data.setdefault(BLE_CLAIMS, set())
+        claims.add(address)
+        async_dispatcher_send(self.hass, SIGNAL_BLE_CLAIM, address, True)
+
+        @callback
+        def _release() -> None:
+            claims.discard(address)
+            async_dispatcher_send(self.hass, SIGNAL_BLE_CLAIM, address, False)
+
+        self.async_on_remove(_release)
+
+        @callback
+        def _push_state(device: str, state: dict) -> None:
+            # A pushed event is the newest report, whichever transport sent the last command
+            if self._cloud is not None and device == self._cloud[1]['device'] and not self._transition.running:
+                self._apply_state(state)
+                self.async_write_ha_state()
+
+        self.async_on_remove(async_dispatcher_connect(self.hass, SIGNAL_PUSH_STATE, _push_state))
+
+    async def async_will_remove_from_hass(self) -> None:
+        await self._transition.async_cancel()
+
+    async def async_update(self):
+        """Reconcile state from the cloud unless a command was sent since the request started."""
+        if self._cloud is None or self._transition.running:
+            return
+
+        api, device = self._cloud
+        if not _should_poll_cloud(self.hass, api, device['device'], self._last_poll):
+            return
+
+        started = self._last_poll = time.monotonic()
+        state = parse_device_state(await api.get_device_state(device['sku'], device['device']))
+        if started < self._last_command:
+            return
+        self._apply_state(state)
+
+    def _apply_state(self, state: dict) -> None:
+        if 'is_on' in state:
+            self._state = state['is_on']
+        if 'brightness' in state:
+            self._brightness = self._output_brightness = state['brightness']
+        if 'rgb_color' in state:
+            self._attr_rgb_color = state['rgb_color']
 
     @property
     def name(self) -> str:
@@ -255,40 +489,52 @@ class GoveeBluetoothLight(LightEntity):
         return self._state
 
     async def async_turn_on(self, **kwargs) -> None:
+        await self._transition.async_cancel()
         commands = [self._prepareSinglePacketData(LedCommand.POWER, [0x1])]
 
+        was_on = self._state
         self._state = True
 
-        if ATTR_BRIGHTNESS in kwargs:
-            brightness = kwargs.get(ATTR_BRIGHTNESS, 255)
-            commands.append(self._prepareSinglePacketData(LedCommand.BRIGHTNESS, [brightness]))
-            self._brightness = brightness
+        target = LightFrame(brightness=kwargs.get(ATTR_BRIGHTNESS), rgb_color=kwargs.get(ATTR_RGB_COLOR))
+        transition = kwargs.get(ATTR_TRANSITION)
+        min_interval = 0.0
+        if transition and ATTR_EFFECT not in kwargs and (target != LightFrame() or not was_on):
+            if target.brightness is None:
+                target = replace(target, brightness=self._brightness or 255)
+            min_interval = self._frameInterval(target)
+
+        if transition and ATTR_EFFECT not in kwargs and target.brightness is not None and transition > min_interval:
+            start = LightFrame(brightness=self._output_brightness if was_on else 1, rgb_color=self._attr_rgb_color)
+            self._brightness = target.brightness
+            if target.rgb_color is not None:
+                self._attr_rgb_color = target.rgb_color
+
+            if not was_on:
+                # Dim first so the light does not flash at its previous brightness
+                dimmed = LightFrame(brightness=start.brightness)
+                await self._route(lambda: self._writeCommands(self._frameCommands(dimmed) + commands),
+                                  lambda: self._cloudCommand(power=True, frame=dimmed))
+                self._output_brightness = start.brightness
+            await self._transition.async_start(self.hass, start, target, transition, min_interval=min_interval)
+            return
+
+        if target.brightness is None and self._brightness is not None and self._output_brightness != self._brightness:
+            # A faded out light is left dimmed, bring it back to the remembered level
+            target = replace(target, brightness=self._brightness)
+
+        if target.brightness is not None:
+            self._brightness = target.brightness
+        if target.rgb_color is not None:
+            self._attr_rgb_color = target.rgb_color
+        commands.extend(self._frameCommands(target))
 
-        if ATTR_RGB_COLOR in kwargs:
-            red, green, blue = kwargs.get(ATTR_RGB_COLOR)
-
-            if self._is_segmented:
-                commands.append(self._prepareSinglePacketData(LedCommand.COLOR,
-                                                              [LedMode.SEGMENTS, 0x01, red, green, blue, 0x00, 0x00, 0x00,
-                                                               0x00, 0x00, 0xFF, 0x7F]))
-            else:
-                commands.append(self._prepareSinglePacketData(LedCommand.COLOR, [LedMode.MANUAL, red, green, blue]))
         if ATTR_EFFECT in kwargs:
             effect = kwargs.get(ATTR_EFFECT)
             if len(effect) > 0:
-                search = EFFECT_PARSE.search(effect)
-
-                # Parse effect indexes
-                categoryIndex = int(search.group(1))
-                sceneIndex = int(search.group(2))
-                lightEffectIndex = int(search.group(3))
-                specialEffectIndex = int(search.group(4))
-
-                json_data = json.loads(Path(Path(__file__).parent / "jsons" / (self._model + ".json")).read_text())
-                category = json_data['data']['categories'][categoryIndex]
-                scene = category['scenes'][sceneIndex]
-                lightEffect = scene['lightEffects'][lightEffectIndex]
-                specialEffect = lightEffect['specialEffect'][specialEffectIndex]
+                index = self._catalog.get(self._model)
+                specialEffect = index.special_effect(effect) if index is not None else None
+                if specialEffect is None:
+                    raise ServiceValidationError(f"Unknown effect: {effect}")
 
                 # Prepare packets to send big payload in separated chunks
                 for command in prepareMultiplePacketsData(0xa3,
@@ -298,16 +544,97 @@ class GoveeBluetoothLight(LightEntity):
                                                                       )):
                     commands.append(command)
 
-        for command in commands:
-            client = await self._connectBluetooth()
-            await client.write_gatt_char(UUID_CONTROL_CHARACTERISTIC, command, False)
+        # BLE scenes have no cloud equivalent
+        cloud = None if ATTR_EFFECT in kwargs else lambda: self._cloudCommand(power=True, frame=target)
+        await self._route(lambda: self._writeCommands(commands), cloud)
+        if target.brightness is not None:
+            self._output_brightness = target.brightness
 
     async def async_turn_off(self, **kwargs) -> None:
-        client = await self._connectBluetooth()
-        await client.write_gatt_char(UUID_CONTROL_CHARACTERISTIC,
-                                     self._prepareSinglePacketData(LedCommand.POWER, [0x0]), False)
+        await self._transition.async_cancel()
+        power_off = self._prepareSinglePacketData(LedCommand.POWER, [0x0])
+
+        transition = kwargs.get(ATTR_TRANSITION)
+        brightness = self._output_brightness if self._output_brightness is not None else self._brightness
+        min_interval = self._frameInterval(LightFrame(brightness=0))
+        if transition and transition > min_interval and self._state and brightness:
+            self._state = False
+            await self._transition.async_start(
+                self.hass, LightFrame(brightness=brightness), LightFrame(brightness=0), transition,
+                after=lambda: self._route(lambda: self._writeCommands([power_off]),
+                                          lambda: self._cloudCommand(power=False)),
+                min_interval=min_interval
+            )
+            return
+
+        await self._route(lambda: self._writeCommands([power_off]), lambda: self._cloudCommand(power=False))
         self._state = False
 
+    def _frameCommands(self, frame: LightFrame) -> list[bytes]:
+        commands = []
+        if frame.brightness is not None:
+            commands.append(self._prepareSinglePacketData(LedCommand.BRIGHTNESS, [frame.brightness]))
+
+        if frame.rgb_color is not None:
+            red, green, blue = frame.rgb_color
+
+            if self._is_segmented:
+                commands.append(self._prepareSinglePacketData(LedCommand.COLOR,
+                                                              [LedMode.SEGMENTS, 0x01, red, green, blue, 0x00, 0x00, 0x00,
+                                                               0x00, 0x00, 0xFF, 0x7F]))
+            else:
+                commands.append(self._prepareSinglePacketData(LedCommand.COLOR, [LedMode.MANUAL, red, green, blue]))
+        return commands
+
+    async def _sendFrame(self, frame: LightFrame) -> None:
+        """Transition frame sender."""
+        await self._route(lambda: self._writeFrame(frame), lambda: self._cloudCommand(frame=frame))
+        if frame.brightness is not None:
+            self._output_brightness = frame.brightness
+
+    async def _writeFrame(self, frame: LightFrame) -> None:
+        """One connection for all packets of the frame."""
+        client = await self._connectBluetooth()
+        if client is None:
+            raise HomeAssistantError(f"Could not connect to {self._mac}")
+        for command in self._frameCommands(frame):
+            await client.write_gatt_char(UUID_CONTROL_CHARACTERISTIC, command, False)
+
+    def _preferredTransport(self) -> str:
+        return self._router.order([TRANSPORT_BLE] + ([TRANSPORT_API] if self._cloud is not None else []))[0]
+
+    def _frameInterval(self, frame: LightFrame) -> float:
+        if self._preferredTransport() == TRANSPORT_BLE:
+            return BLE_FRAME_INTERVAL
+        return API_REQUEST_INTERVAL * (1 + (frame.rgb_color is not None))
+
+    async def _route(self, ble, cloud=None) -> None:
+        """Send over the best transport, falling back to the other one on failure."""
+        transport = await self._router.async_call({
+            TRANSPORT_BLE: ble,
+            TRANSPORT_API: cloud if self._cloud is not None else None,
+        })
+        self._last_command = time.monotonic()
+        _LOGGER.debug("Command for %s sent over %s", self._mac, transport)
+
+    async def _cloudCommand(self, power: bool | None = None, frame: LightFrame = LightFrame()) -> None:
+        api, device = self._cloud
+        sku, device_id = device['sku'], device['device']
+        if frame.brightness is not None:
+            _check_response(await api.set_brightness(sku, device_id, _api_brightness(frame.brightness)))
+        if frame.rgb_color is not None:
+            red, green, blue = frame.rgb_color
+            _check_response(await api.set_color_rgb(sku, device_id, red, green, blue))
+        if power is not None:
+            _check_response(await api.toggle_power(sku, device_id, 1 if power else 0))
+
+    async def _writeCommands(self, commands: list) -> None:
+        for command in commands:
+            client = await self._connectBluetooth()
+            if client is None:
+                raise HomeAssistantError(f"Could not connect to {self._mac}")
+            await client.write_gatt_char(UUID_CONTROL_CHARACTERISTIC, command, False)
+
     async def _connectBluetooth(self) -> BleakClient:
         for i in range(3):
             try:
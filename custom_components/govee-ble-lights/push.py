@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+
+import aiomqtt
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util.ssl import client_context
+
+from .const import DOMAIN, SIGNAL_PUSH_STATE
+from .govee_api import parse_device_state
+
+_LOGGER = logging.getLogger(__name__)
+
+PUSH_HOST = "mqtt.openapi.govee.com"
+PUSH_PORT = 8883
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 300.0
+
+
+def decode_event(payload: bytes) -> tuple[str, dict] | None:
+    """Return the device id and light attributes carried by a push message."""
+    try:
+        message = json.loads(payload)
+        device = message["device"]
+        state = parse_device_state(message)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        _LOGGER.debug("Ignoring undecodable push message: %s", payload)
+        return None
+    return device, state
+
+
+class GoveePushClient:
+    """One MQTT subscription to the Govee event stream of an API key.
+
+    Govee mostly pushes device events rather than state, so a device only
+    counts as delivered once the stream has carried a usable state update for
+    it, and stops counting as soon as the connection drops.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_key: str, host: str = PUSH_HOST, port: int = PUSH_PORT,
+                 tls: bool = True) -> None:
+        self.hass = hass
+        self.api_key = api_key
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self.delivered: set[str] = set()
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        self._task = self.hass.async_create_background_task(self._async_run(), f"{DOMAIN} push")
+
+    @callback
+    def async_stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.delivered.clear()
+
+    async def _async_run(self) -> None:
+        tls_context = await self.hass.async_add_executor_job(client_context) if self.tls else None
+        delay = RECONNECT_MIN_DELAY
+        try:
+            while True:
+                try:
+                    async with aiomqtt.Client(
+                            self.host, self.port, username=self.api_key, password=self.api_key,
+                            tls_context=tls_context,
+                    ) as client:
+                        await client.subscribe(f"GA/{self.api_key}")
+                        _LOGGER.debug("Govee push stream connected")
+                        delay = RECONNECT_MIN_DELAY
+
+                        async for message in client.messages:
+                            event = decode_event(message.payload)
+                            if event is not None and event[1]:
+                                self.delivered.add(event[0])
+                                async_dispatcher_send(self.hass, SIGNAL_PUSH_STATE, *event)
+                except aiomqtt.MqttError as err:
+                    _LOGGER.debug("Govee push stream down, retrying in %.0f s: %s", delay, err)
+                except Exception:
+                    _LOGGER.warning("Govee push stream failed, retrying in %.0f s", delay, exc_info=True)
+
+                self.delivered.clear()
+                await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        finally:
+            self.delivered.clear()
+
+
+class GoveePush:
+    """Push connections shared by all entries, one per API key."""
+
+    def __init__(self, hass: HomeAssistant, host: str = PUSH_HOST, port: int = PUSH_PORT, tls: bool = True) -> None:
+        self.hass = hass
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self._clients: dict[str, GoveePushClient] = {}
+        self._refs: dict[str, int] = {}
+
+    @callback
+    def async_acquire(self, api_key: str) -> None:
+        self._refs[api_key] = self._refs.get(api_key, 0) + 1
+        if api_key not in self._clients:
+            client = GoveePushClient(self.hass, api_key, self.host, self.port, self.tls)
+            self._clients[api_key] = client
+            client.async_start()
+
+    @callback
+    def async_release(self, api_key: str) -> None:
+        self._refs[api_key] -= 1
+        if self._refs[api_key] <= 0:
+            self._refs.pop(api_key)
+            self._clients.pop(api_key).async_stop()
+
+    def streaming(self, api_keys, device: str) -> bool:
+        """Whether the push stream of any of the keys currently delivers the device's state."""
+        return any(key in self._clients and device in self._clients[key].delivered for key in api_keys)
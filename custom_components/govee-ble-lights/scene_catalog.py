@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SIGNAL_SCENE_CATALOG_UPDATED
+
+_LOGGER = logging.getLogger(__name__)
+
+CATALOG_URL = "https://app2.govee.com/appsku/v1/light-effect-libraries"
+CATALOG_APP_VERSION = "5.6.01"
+REFRESH_INTERVAL = timedelta(hours=12)
+JSONS_PATH = Path(__file__).parent / "jsons"
+EFFECT_PARSE = re.compile(r"\[(\d+)/(\d+)/(\d+)/(\d+)]")
+
+
+def catalog_digest(data: dict) -> str:
+    """Hash catalog content independently of how the server serialized it."""
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def effect_name(category: dict, scene: dict, lightEffect: dict, indexes: tuple[int, int, int, int]) -> str:
+    # Workaround cause we need to store some metadata in effect (effect names not unique)
+    return (category['categoryName'] + " - " + scene['sceneName'] + ' - ' + lightEffect['scenceName']
+            + " [" + "/".join(str(i) for i in indexes) + "]")
+
+
+class SceneIndex:
+    """Read-only view over one model's scene catalog.
+
+    A new index is built for every catalog change and swapped in as a whole,
+    so readers never see a half-updated effect list.
+    """
+
+    def __init__(self, data: dict, digest: str, bundled: bool) -> None:
+        self.data = data
+        self.digest = digest
+        self.bundled = bundled
+        self.effect_list: list[str] = []
+
+        for categoryIdx, category in enumerate(data['data']['categories']):
+            for sceneIdx, scene in enumerate(category['scenes']):
+                for leffectIdx, lightEffect in enumerate(scene['lightEffects']):
+                    for seffectIxd, specialEffect in enumerate(lightEffect['specialEffect']):
+                        self.effect_list.append(
+                            effect_name(category, scene, lightEffect, (categoryIdx, sceneIdx, leffectIdx, seffectIxd)))
+
+    def special_effect(self, effect: str) -> dict | None:
+        """Resolve an effect name from effect_list to its specialEffect entry."""
+        search = EFFECT_PARSE.search(effect)
+        if search is None:
+            return None
+
+        categoryIndex, sceneIndex, lightEffectIndex, specialEffectIndex = (int(g) for g in search.groups())
+        try:
+            category = self.data['data']['categories'][categoryIndex]
+            scene = category['scenes'][sceneIndex]
+            lightEffect = scene['lightEffects'][lightEffectIndex]
+            specialEffect = lightEffect['specialEffect'][specialEffectIndex]
+        except IndexError:
+            return None
+
+        # Names saved before a catalog update may point at a different scene now
+        indexes = (categoryIndex, sceneIndex, lightEffectIndex, specialEffectIndex)
+        if effect_name(category, scene, lightEffect, indexes) != effect:
+            return None
+        return specialEffect
+
+
+class SceneCatalog:
+    """Scene catalogs for BLE models.
+
+    The bundled ``jsons/`` files are always the fallback. Catalogs of models in
+    use are refreshed from Govee in the background with conditional requests,
+    and only catalogs that differ from the bundled copy are kept in the Store.
+    """
+
+    def __init__(self, hass: HomeAssistant, url: str = CATALOG_URL,
+                 interval: timedelta = REFRESH_INTERVAL) -> None:
+        self.hass = hass
+        self.url = url
+        self.interval = interval
+        self._index: dict[str, SceneIndex] = {}
+        self._bundled_digests: dict[str, str] = {}
+        self._models: dict[str, int] = {}
+        self._etags: dict[str, str] | None = None
+        self._etag_store = Store(hass, 1, f"{DOMAIN}/scene_catalog_etags.json")
+        self._lock = asyncio.Lock()
+        self._unsub_refresh: Callable[[], None] | None = None
+
+    def get(self, model: str) -> SceneIndex | None:
+        """Return the current index for a model, if loaded."""
+        return self._index.get(model)
+
+    def _store(self, model: str) -> Store:
+        return Store(self.hass, 1, f"{DOMAIN}/scene_catalog_{model}.json")
+
+    def _load_bundled(self, model: str) -> SceneIndex | None:
+        path = JSONS_PATH / (model + ".json")
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        return SceneIndex(data, catalog_digest(data), True)
+
+    async def async_load(self, model: str) -> SceneIndex | None:
+        """Load a model's catalog, preferring a stored update over the bundled file."""
+        if model in self._index:
+            return self._index[model]
+
+        bundled = await self.hass.async_add_executor_job(self._load_bundled, model)
+        if bundled is not None:
+            self._bundled_digests[model] = bundled.digest
+
+        stored = await self._store(model).async_load()
+        if stored and stored.get("digest") != self._bundled_digests.get(model):
+            _LOGGER.debug("Using updated scene catalog for %s", model)
+            self._index[model] = await self.hass.async_add_executor_job(
+                SceneIndex, stored["data"], stored["digest"], False
+            )
+        elif bundled is not None:
+            self._index[model] = bundled
+
+        return self._index.get(model)
+
+    @callback
+    def async_register(self, model: str) -> Callable[[], None]:
+        """Keep a model's catalog refreshed while at least one entry uses it."""
+        if model not in self._models:
+            # Newly used models are refreshed right away instead of at the next interval
+            self.hass.async_create_background_task(
+                self.async_refresh([model]), f"{DOMAIN} scene catalog refresh"
+            )
+        self._models[model] = self._models.get(model, 0) + 1
+        if self._unsub_refresh is None:
+            self._unsub_refresh = async_track_time_interval(
+                self.hass, self._async_scheduled_refresh, self.interval
+            )
+
+        @callback
+        def _unregister() -> None:
+            self._models[model] -= 1
+            if self._models[model] <= 0:
+                self._models.pop(model)
+            if not self._models and self._unsub_refresh is not None:
+                self._unsub_refresh()
+                self._unsub_refresh = None
+
+        return _unregister
+
+    async def _async_scheduled_refresh(self, _now=None) -> None:
+        self.hass.async_create_background_task(
+            self.async_refresh(), f"{DOMAIN} scene catalog refresh"
+        )
+
+    async def async_refresh(self, models: list[str] | None = None) -> None:
+        """Refresh catalogs of the given models, all registered models by default."""
+        async with self._lock:
+            if self._etags is None:
+                self._etags = await self._etag_store.async_load() or {}
+
+            for model in models if models is not None else list(self._models):
+                if model not in self._models:
+                    continue
+                try:
+                    await self._async_refresh_model(model)
+                except Exception:
+                    _LOGGER.warning("Failed to refresh scene catalog for %s", model, exc_info=True)
+
+            await self._etag_store.async_save(self._etags)
+
+    def _fetch(self, model: str, etag: str | None, current: str | None) -> tuple[str | None, SceneIndex | None]:
+        """Fetch, parse, hash and index a catalog off the event loop.
+
+        Returns the response ETag and a new index, or no index when the catalog is unchanged or missing.
+        """
+        headers = {"AppVersion": CATALOG_APP_VERSION}
+        if etag:
+            headers["If-None-Match"] = etag
+        response = requests.get(self.url, params={"sku": model}, headers=headers, timeout=30)
+        if response.status_code == 304:
+            _LOGGER.debug("Scene catalog for %s not modified", model)
+            return etag, None
+        response.raise_for_status()
+
+        data = response.json()
+        if not isinstance(data.get("data"), dict) or "categories" not in data["data"]:
+            _LOGGER.debug("No scene catalog for %s: %s", model, data.get("message"))
+            return etag, None
+
+        digest = catalog_digest(data)
+        if digest == current:
+            return response.headers.get("ETag", etag), None
+        return response.headers.get("ETag", etag), SceneIndex(data, digest, digest == self._bundled_digests.get(model))
+
+    async def _async_refresh_model(self, model: str) -> None:
+        await self.async_load(model)
+        current = self._index.get(model)
+
+        etag, index = await self.hass.async_add_executor_job(
+            self._fetch, model, self._etags.get(model) if current else None, current.digest if current else None
+        )
+        if etag:
+            self._etags[model] = etag
+        if index is None:
+            return
+
+        if index.bundled:
+            await self._store(model).async_remove()
+        else:
+            await self._store(model).async_save({"digest": index.digest, "data": index.data})
+
+        self._index[model] = index
+        _LOGGER.info("Scene catalog for %s updated (%d effects)", model, len(index.effect_list))
+        async_dispatcher_send(self.hass, SIGNAL_SCENE_CATALOG_UPDATED, model)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest sample in the link latency average
+LATENCY_SMOOTHING = 0.3
+
+
+@dataclass(frozen=True)
+class LightFrame:
+    """Light output at one point of a transition. None means "not controlled"."""
+    brightness: int | None = None
+    rgb_color: tuple[int, int, int] | None = None
+    color_temp_kelvin: int | None = None
+
+
+def _lerp(start: int | None, end: int | None, progress: float) -> int | None:
+    if end is None:
+        return None
+    if start is None:
+        return end
+    return round(start + (end - start) * progress)
+
+
+def interpolate(start: LightFrame, target: LightFrame, progress: float) -> LightFrame:
+    """Linear blend between two frames; values unknown at start jump to the target."""
+    rgb_color = None
+    if target.rgb_color is not None:
+        if start.rgb_color is None:
+            rgb_color = target.rgb_color
+        else:
+            rgb_color = tuple(_lerp(s, e, progress) for s, e in zip(start.rgb_color, target.rgb_color))
+
+    return LightFrame(
+        brightness=_lerp(start.brightness, target.brightness, progress),
+        rgb_color=rgb_color,
+        color_temp_kelvin=_lerp(start.color_temp_kelvin, target.color_temp_kelvin, progress),
+    )
+
+
+class TransitionEngine:
+    """Client-side fades for lights that can only jump to a value.
+
+    Frames are sent one at a time and each one is computed from the clock when
+    the link is ready for it, so a slow link skips intermediate values instead
+    of queueing them. The frame interval follows the measured send latency and
+    never drops below ``min_interval`` (the link's rate budget).
+    """
+
+    def __init__(self, send: Callable[[LightFrame], Awaitable[None]], min_interval: float) -> None:
+        self.send = send
+        self.min_interval = min_interval
+        self.latency: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def async_send(self, frame: LightFrame) -> None:
+        """Send one frame and record how long the link took."""
+        started = time.monotonic()
+        await self.send(frame)
+        elapsed = time.monotonic() - started
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += (elapsed - self.latency) * LATENCY_SMOOTHING
+
+    async def async_cancel(self) -> None:
+        """Stop the running transition, leaving the light at its last frame."""
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def async_start(self, hass: HomeAssistant, start: LightFrame, target: LightFrame, duration: float,
+                          after: Callable[[], Awaitable[None]] | None = None,
+                          min_interval: float | None = None) -> None:
+        """Cancel any running transition and fade from start to target in the background."""
+        await self.async_cancel()
+        self._task = hass.async_create_background_task(
+            self._async_run(start, target, duration, after, min_interval),
+            "govee transition",
+        )
+
+    async def _async_run(self, start: LightFrame, target: LightFrame, duration: float,
+                         after: Callable[[], Awaitable[None]] | None,
+                         min_interval: float | None) -> None:
+        interval_floor = self.min_interval if min_interval is None else min_interval
+        if duration <= interval_floor:
+            # Too short for an intermediate frame, go straight to the target
+            duration = 0
+        started = time.monotonic()
+        # The light is already at the start values, the first frame sent is the first step
+        last = start
+
+        try:
+            while True:
+                progress = 1.0 if duration <= 0 else min(1.0, (time.monotonic() - started) / duration)
+                frame = interpolate(start, target, progress)
+
+                # Only resend the channels that actually moved
+                frame = replace(
+                    frame,
+                    brightness=None if frame.brightness == last.brightness else frame.brightness,
+                    rgb_color=None if frame.rgb_color == last.rgb_color else frame.rgb_color,
+                    color_temp_kelvin=None if frame.color_temp_kelvin == last.color_temp_kelvin
+                    else frame.color_temp_kelvin,
+                )
+
+                frame_started = time.monotonic()
+                if frame != LightFrame():
+                    await self.async_send(frame)
+                    last = interpolate(start, target, progress)
+
+                if progress >= 1.0:
+                    break
+
+                interval = max(interval_floor, self.latency or 0.0)
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - frame_started)))
+
+            if after is not None:
+                await after()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            _LOGGER.warning("Transition aborted", exc_info=True)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from typing import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSPORT_BLE = 'ble'
+TRANSPORT_API = 'api'
+
+# Weight of the newest sample in the latency and success averages
+SAMPLE_SMOOTHING = 0.3
+# An idle link's success rate drifts back to healthy with this half-life (seconds),
+# so a transport that failed once is tried again eventually
+RECOVERY_HALF_LIFE = 300.0
+
+
+def ble_address(device_id: str) -> str:
+    """Bluetooth address of a cloud device: Govee device ids are two bytes followed by the MAC."""
+    return ":".join(device_id.upper().split(":")[-6:])
+
+
+class LinkStats:
+    """Recent latency and success rate of one transport."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self._success = 1.0
+        self._updated = time.monotonic()
+
+    @property
+    def success(self) -> float:
+        idle = time.monotonic() - self._updated
+        return 1.0 - (1.0 - self._success) * 0.5 ** (idle / RECOVERY_HALF_LIFE)
+
+    @property
+    def cost(self) -> float:
+        """Expected time per delivered command; lower is better."""
+        return self.latency / max(self.success, 0.05)
+
+    def record(self, ok: bool, elapsed: float) -> None:
+        self._success = self.success + ((1.0 if ok else 0.0) - self.success) * SAMPLE_SMOOTHING
+        if ok:
+            self.latency += (elapsed - self.latency) * SAMPLE_SMOOTHING
+        self._updated = time.monotonic()
+
+
+class HybridRouter:
+    """Sends each command over the cheapest transport and falls back to the others on failure."""
+
+    def __init__(self) -> None:
+        # Until measured, prefer the local link
+        self.links = {
+            TRANSPORT_BLE: LinkStats(0.5),
+            TRANSPORT_API: LinkStats(1.0),
+        }
+
+    def order(self, transports) -> list[str]:
+        return sorted(transports, key=lambda name: self.links[name].cost)
+
+    async def async_call(self, calls: dict[str, Callable[[], Awaitable[None]] | None]) -> str:
+        """Run the command on the first transport that succeeds and return its name."""
+        available = [name for name, call in calls.items() if call is not None]
+        error: Exception | None = None
+        for name in self.order(available):
+            started = time.monotonic()
+            try:
+                await calls[name]()
+            except Exception as err:
+                self.links[name].record(False, time.monotonic() - started)
+                _LOGGER.debug("Command over %s failed, trying next transport", name, exc_info=True)
+                error = err
+                continue
+            self.links[name].record(True, time.monotonic() - started)
+            return name
+
+        if error is None:
+            raise ValueError("No transport available")
+        raise error
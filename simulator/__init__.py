@@ -0,0 +1 @@
+"""Virtual Govee fleet for load and soak testing the integration without hardware."""
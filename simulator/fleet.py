@@ -0,0 +1,266 @@
+"""Virtual Govee lights reachable over BLE and through a local Govee cloud API server."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+from .protocol import FrameDecoder, ProtocolError
+
+SKU = "H6006"
+
+
+@dataclass
+class Faults:
+    """Latency and failure injection shared by the whole fleet."""
+    ble_connect_latency: tuple[float, float] = (0.05, 0.3)
+    ble_write_latency: tuple[float, float] = (0.005, 0.03)
+    ble_connect_failure_rate: float = 0.0
+    api_latency: tuple[float, float] = (0.05, 0.2)
+    api_failure_rate: float = 0.0
+    # Govee limits: 10 requests per device per minute, 10000 per key per day
+    api_device_requests_per_minute: int = 10
+    api_key_requests_per_day: int = 10000
+
+    async def sleep(self, bounds: tuple[float, float]) -> None:
+        await asyncio.sleep(random.uniform(*bounds))
+
+
+@dataclass
+class VirtualLight:
+    address: str
+    device_id: str
+    name: str
+    sku: str = SKU
+    is_on: bool = False
+    brightness: int = 255
+    rgb_color: tuple[int, int, int] = (255, 255, 255)
+    color_temp_kelvin: int = 0
+    scene: str | None = None
+    frames: int = 0
+    protocol_errors: list[str] = field(default_factory=list)
+    decoder: FrameDecoder = field(default_factory=FrameDecoder)
+    requests: deque = field(default_factory=deque)
+
+    def apply(self, change: dict) -> None:
+        for key, value in change.items():
+            setattr(self, key, value)
+
+    def api_device(self) -> dict:
+        """Device entry as listed by GET /user/devices."""
+        return {
+            "sku": self.sku,
+            "device": self.device_id,
+            "deviceName": self.name,
+            "type": "devices.types.light",
+            "capabilities": [
+                {"type": "devices.capabilities.on_off", "instance": "powerSwitch"},
+                {"type": "devices.capabilities.range", "instance": "brightness",
+                 "parameters": {"range": {"min": 1, "max": 100}}},
+                {"type": "devices.capabilities.color_setting", "instance": "colorRgb"},
+                {"type": "devices.capabilities.color_setting", "instance": "colorTemperatureK",
+                 "parameters": {"range": {"min": 2000, "max": 9000}}},
+            ],
+        }
+
+    def in_range(self, instance: str, value) -> bool:
+        """Check a value against the range this device advertises for a capability."""
+        for capability in self.api_device()["capabilities"]:
+            if capability["instance"] == instance:
+                bounds = capability["parameters"]["range"]
+                return isinstance(value, (int, float)) and bounds["min"] <= value <= bounds["max"]
+        return False
+
+    def api_state(self) -> list:
+        rgb = (self.rgb_color[0] << 16) | (self.rgb_color[1] << 8) | self.rgb_color[2]
+        return [
+            {"instance": "powerSwitch", "state": {"value": 1 if self.is_on else 0}},
+            {"instance": "brightness", "state": {"value": round(self.brightness / 255 * 100)}},
+            {"instance": "colorRgb", "state": {"value": rgb}},
+            {"instance": "colorTemperatureK", "state": {"value": self.color_temp_kelvin}},
+        ]
+
+
+class VirtualBLEDevice:
+    """Stands in for bleak's BLEDevice."""
+
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self.name = f"Govee_{address[-5:].replace(':', '')}"
+
+
+class VirtualBleakClient:
+    """Stands in for a connected BleakClient."""
+
+    def __init__(self, fleet: Fleet, light: VirtualLight) -> None:
+        self.fleet = fleet
+        self.light = light
+        self.is_connected = True
+
+    async def write_gatt_char(self, characteristic, data, response: bool = False) -> None:
+        await self.fleet.faults.sleep(self.fleet.faults.ble_write_latency)
+        self.light.frames += 1
+        try:
+            change = self.light.decoder.feed(data)
+        except ProtocolError as err:
+            self.light.protocol_errors.append(str(err))
+            self.light.decoder = FrameDecoder()
+            return
+        if change:
+            self.light.apply(change)
+
+    async def disconnect(self) -> bool:
+        self.is_connected = False
+        return True
+
+
+class Fleet:
+    """Hundreds of virtual lights sharing one fault profile."""
+
+    def __init__(self, size: int, faults: Faults | None = None, api_keys: list[str] | None = None) -> None:
+        self.faults = faults or Faults()
+        self.lights: dict[str, VirtualLight] = {}
+        self.api_keys = api_keys or ["sim-key"]
+        self.key_requests: dict[str, deque] = {key: deque() for key in self.api_keys}
+        self.rate_limited = 0
+
+        for i in range(size):
+            address = "A4:C1:38:{:02X}:{:02X}:{:02X}".format((i >> 16) & 0xFF, (i >> 8) & 0xFF, i & 0xFF)
+            self.lights[address] = VirtualLight(
+                address=address, device_id=f"1A:2B:{address}", name=f"Virtual light {i}",
+            )
+
+    def by_device(self, device_id: str) -> VirtualLight | None:
+        return self.lights.get(device_id[-17:])
+
+    # BLE
+
+    async def establish_connection(self, client_class, device, name, *args, **kwargs) -> VirtualBleakClient:
+        """Stands in for bleak_retry_connector.establish_connection."""
+        await self.faults.sleep(self.faults.ble_connect_latency)
+        if random.random() < self.faults.ble_connect_failure_rate:
+            raise ConnectionError(f"Virtual connection to {device.address} failed")
+        return VirtualBleakClient(self, self.lights[device.address])
+
+    # Cloud
+
+    def _throttle(self, api_key: str, light: VirtualLight | None) -> web.Response | None:
+        now = time.monotonic()
+        key_window = self.key_requests[api_key]
+        while key_window and key_window[0] < now - 86400:
+            key_window.popleft()
+        remaining = self.faults.api_key_requests_per_day - len(key_window)
+        headers = {"API-RateLimit-Remaining": str(max(0, remaining - 1))}
+
+        retry_after = None
+        if remaining <= 0:
+            retry_after = 86400 - (now - key_window[0])
+        elif light is not None:
+            window = light.requests
+            while window and window[0] < now - 60:
+                window.popleft()
+            if len(window) >= self.faults.api_device_requests_per_minute:
+                retry_after = 60 - (now - window[0])
+            else:
+                window.append(now)
+
+        if retry_after is not None:
+            self.rate_limited += 1
+            headers["Retry-After"] = f"{retry_after:.1f}"
+            return web.json_response({"code": 429, "msg": "Too Many Requests"}, status=429, headers=headers)
+
+        key_window.append(now)
+        return None
+
+    async def _authorize(self, request: web.Request) -> str:
+        api_key = request.headers.get("Govee-API-Key")
+        if api_key not in self.key_requests:
+            raise web.HTTPUnauthorized()
+        await self.faults.sleep(self.faults.api_latency)
+        if random.random() < self.faults.api_failure_rate:
+            raise web.HTTPInternalServerError()
+        return api_key
+
+    async def _device_request(self, request: web.Request) -> tuple[dict, VirtualLight, web.Response | None]:
+        api_key = await self._authorize(request)
+        body = await request.json()
+        if not body.get("requestId") or "payload" not in body:
+            raise web.HTTPBadRequest(text="requestId and payload are required")
+        light = self.by_device(body["payload"].get("device", ""))
+        if light is None or light.sku != body["payload"].get("sku"):
+            raise web.HTTPBadRequest(text="unknown device")
+        return body, light, self._throttle(api_key, light)
+
+    async def handle_devices(self, request: web.Request) -> web.Response:
+        api_key = await self._authorize(request)
+        throttled = self._throttle(api_key, None)
+        if throttled is not None:
+            return throttled
+        return web.json_response({"code": 200, "message": "success",
+                                  "data": [light.api_device() for light in self.lights.values()]})
+
+    async def handle_state(self, request: web.Request) -> web.Response:
+        body, light, throttled = await self._device_request(request)
+        if throttled is not None:
+            return throttled
+        return web.json_response({"requestId": body["requestId"], "code": 200, "msg": "success", "payload": {
+            "sku": light.sku, "device": light.device_id, "capabilities": light.api_state(),
+        }})
+
+    async def handle_control(self, request: web.Request) -> web.Response:
+        body, light, throttled = await self._device_request(request)
+        if throttled is not None:
+            return throttled
+
+        capability = body["payload"].get("capability", {})
+        instance, value = capability.get("instance"), capability.get("value")
+        if instance == "powerSwitch" and value in (0, 1):
+            light.is_on = value == 1
+        elif instance == "brightness" and light.in_range(instance, value):
+            light.brightness = round(value / 100 * 255)
+        elif instance == "colorRgb" and isinstance(value, int) and 0 <= value <= 0xFFFFFF:
+            light.rgb_color = ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+            light.scene = None
+        elif instance == "colorTemperatureK" and light.in_range(instance, value):
+            light.color_temp_kelvin = value
+        elif instance == "lightScene":
+            light.scene = str(value)
+        else:
+            light.protocol_errors.append(f"invalid capability {capability}")
+            return web.json_response({"requestId": body["requestId"], "code": 400, "msg": "Parameter error"})
+
+        return web.json_response({"requestId": body["requestId"], "code": 200, "msg": "success",
+                                  "capability": capability})
+
+    async def handle_scenes(self, request: web.Request) -> web.Response:
+        body, light, throttled = await self._device_request(request)
+        if throttled is not None:
+            return throttled
+        return web.json_response({"requestId": body["requestId"], "code": 200, "payload": {
+            "sku": light.sku, "device": light.device_id, "capabilities": [{
+                "type": "devices.capabilities.dynamic_scene", "instance": "lightScene",
+                "parameters": {"options": [{"name": "Sunrise", "value": {"id": 1, "paramId": 1}}]},
+            }],
+        }})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/router/api/v1/user/devices", self.handle_devices)
+        app.router.add_post("/router/api/v1/device/state", self.handle_state)
+        app.router.add_post("/router/api/v1/device/control", self.handle_control)
+        app.router.add_post("/router/api/v1/device/scenes", self.handle_scenes)
+        return app
+
+    async def start_cloud(self, host: str = "127.0.0.1", port: int = 0) -> tuple[web.AppRunner, str]:
+        """Serve the cloud API locally; returns the runner and the base url for GoveeAPI."""
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        port = runner.addresses[0][1]
+        return runner, f"http://{host}:{port}/router/api/v1"
@@ -0,0 +1,179 @@
+"""Drive the integration's light entities against a virtual fleet and report command latency.
+
+    python -m simulator.loadtest --ble 200 --api 50 --commands 20 --keys 3 --transition 2
+
+Needs the packages from requirements_dev.txt (homeassistant pulls in aiohttp,
+bleak and bleak-retry-connector).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import bleak_retry_connector
+
+from homeassistant.core import HomeAssistant
+
+from .fleet import SKU, Faults, Fleet, VirtualBLEDevice
+
+INTEGRATION_PATH = Path(__file__).parent.parent / "custom_components" / "govee-ble-lights"
+
+
+def load_integration():
+    """Import the integration package, whose directory name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location(
+        "govee_ble_lights", INTEGRATION_PATH / "__init__.py", submodule_search_locations=[str(INTEGRATION_PATH)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["govee_ble_lights"] = module
+    spec.loader.exec_module(module)
+
+    from govee_ble_lights import light, scene_catalog, govee_api, key_pool
+    return module, light, scene_catalog, govee_api, key_pool
+
+
+def percentiles(samples: list[float]) -> str:
+    if len(samples) < 2:
+        return "not enough samples"
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return "p50 {:.0f} ms  p90 {:.0f} ms  p99 {:.0f} ms  max {:.0f} ms".format(
+        cuts[49] * 1000, cuts[89] * 1000, cuts[98] * 1000, max(samples) * 1000
+    )
+
+
+async def drive(entity, effects: list[str], commands: int, think: float, transition: float,
+                latencies: list, failures: list) -> None:
+    for _ in range(commands):
+        # Half of the commands fade when --transition is given
+        fade = {"transition": transition} if transition and random.random() < 0.5 else {}
+        roll = random.random()
+        if roll < 0.2:
+            call = entity.async_turn_off(**fade)
+        elif roll < 0.3 and effects:
+            call = entity.async_turn_on(effect=random.choice(effects))
+        else:
+            call = entity.async_turn_on(
+                brightness=random.randint(1, 255),
+                rgb_color=(random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)),
+                **fade,
+            )
+
+        started = time.monotonic()
+        try:
+            await call
+            latencies.append(time.monotonic() - started)
+        except Exception as err:
+            failures.append(repr(err))
+        await asyncio.sleep(random.uniform(0, think))
+
+
+async def run(args) -> int:
+    integration, light, scene_catalog, govee_api, key_pool = load_integration()
+    config_dir = tempfile.TemporaryDirectory()
+    # Stores and background transition tasks need a running Home Assistant core
+    hass = HomeAssistant(config_dir.name)
+
+    faults = Faults(
+        ble_connect_failure_rate=args.ble_failure_rate,
+        api_failure_rate=args.api_failure_rate,
+        api_device_requests_per_minute=args.api_rate,
+    )
+    fleet = Fleet(args.ble + args.api, faults, [f"sim-key-{i}" for i in range(args.keys)])
+    runner, base_url = await fleet.start_cloud()
+    bleak_retry_connector.establish_connection = fleet.establish_connection
+
+    bundled = json.loads((INTEGRATION_PATH / "jsons" / f"{SKU}.json").read_text())
+    index = scene_catalog.SceneIndex(bundled, scene_catalog.catalog_digest(bundled), True)
+    catalog = {SKU: index}
+    api = key_pool.GoveeKeyPool(
+        hass, "loadtest", [govee_api.GoveeAPI(key, base_url=base_url) for key in fleet.api_keys]
+    )
+    await api.async_load()
+    await api.list_devices()
+
+    lights = list(fleet.lights.values())
+    entities = []
+    for virtual in lights[:args.ble]:
+        hub = integration.Hub(None, address=virtual.address)
+        entity = light.GoveeBluetoothLight(
+            hub, VirtualBLEDevice(virtual.address), SimpleNamespace(data={"model": SKU}), catalog
+        )
+        entity.hass = hass
+        if args.hybrid:
+            entity._cloud = (api, virtual.api_device())
+        entities.append((entity, index.effect_list[:20]))
+
+    with warnings.catch_warnings():
+        # GoveeAPILight schedules its scene lookup on construction
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for virtual in lights[args.ble:]:
+            entity = light.GoveeAPILight(integration.Hub(api), virtual.api_device())
+            entity.hass = hass
+            entities.append((entity, []))
+
+    latencies: dict[str, list[float]] = {"ble": [], "api": []}
+    failures: list[str] = []
+    started = time.monotonic()
+    await asyncio.gather(*(
+        drive(entity, effects, args.commands, args.think, args.transition,
+              latencies["ble" if isinstance(entity, light.GoveeBluetoothLight) else "api"], failures)
+        for entity, effects in entities
+    ))
+    while any(entity._transition.running for entity, _ in entities):
+        await asyncio.sleep(0.1)
+    elapsed = time.monotonic() - started
+    await runner.cleanup()
+    await hass.async_stop(force=True)
+    config_dir.cleanup()
+
+    mismatched = sum(
+        1 for (entity, _), virtual in zip(entities, lights)
+        if entity.is_on is not None and entity.is_on != virtual.is_on
+    )
+    protocol_errors = [error for virtual in lights for error in virtual.protocol_errors]
+
+    print(f"{len(entities)} lights, {args.commands} commands each, {elapsed:.1f} s")
+    for transport, samples in latencies.items():
+        if samples:
+            print(f"  {transport}: {len(samples)} commands, {percentiles(samples)}")
+    print(f"  BLE frames written: {sum(virtual.frames for virtual in lights)}")
+    print(f"  failed commands: {len(failures)}, rate limited responses: {fleet.rate_limited}")
+    print("  requests per key: " + ", ".join(
+        f"{key} {len(requests)}" for key, requests in fleet.key_requests.items()
+    ))
+    print(f"  protocol errors: {len(protocol_errors)}, state mismatches: {mismatched}")
+    for error in sorted(set(protocol_errors + failures))[:10]:
+        print(f"    {error}")
+
+    return 1 if protocol_errors else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ble", type=int, default=100, help="virtual lights controlled over BLE")
+    parser.add_argument("--api", type=int, default=20, help="virtual lights controlled through the cloud API")
+    parser.add_argument("--hybrid", action="store_true", help="give BLE lights a cloud fallback")
+    parser.add_argument("--commands", type=int, default=10, help="commands sent to each light")
+    parser.add_argument("--think", type=float, default=0.5, help="max pause between commands (s)")
+    parser.add_argument("--transition", type=float, default=0.0, help="fade duration for half of the commands (s)")
+    parser.add_argument("--keys", type=int, default=1, help="API keys pooled by the cloud entities")
+    parser.add_argument("--ble-failure-rate", type=float, default=0.0)
+    parser.add_argument("--api-failure-rate", type=float, default=0.0)
+    parser.add_argument("--api-rate", type=int, default=10, help="API requests per device per minute")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
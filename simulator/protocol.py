@@ -0,0 +1,91 @@
+"""Device side of the Govee BLE protocol, as spoken by light.py and govee_utils.py."""
+from __future__ import annotations
+
+FRAME_LENGTH = 20
+SINGLE_PACKET = 0x33
+MULTI_PACKET = 0xa3
+LAST_PACKET_INDEX = 0xff
+
+CMD_POWER = 0x01
+CMD_BRIGHTNESS = 0x04
+CMD_COLOR = 0x05
+MODE_MANUAL = 0x02
+MODE_SEGMENTS = 0x15
+
+
+class ProtocolError(Exception):
+    """A frame a real device would have rejected."""
+
+
+def checksum(data: bytes) -> int:
+    value = 0
+    for b in data:
+        value ^= b
+    return value & 0xFF
+
+
+class FrameDecoder:
+    """Validates frames for one connection and turns them into state changes.
+
+    Multi packet payloads (scenes) must arrive as: a head packet announcing the
+    packet count, numbered body packets, then the 0xff tail packet.
+    """
+
+    def __init__(self) -> None:
+        self._expected: int | None = None
+        self._next_index = 0
+        self._multi: list[bytes] = []
+
+    def feed(self, frame: bytes) -> dict | None:
+        """Return the state change carried by a frame, or None while a scene is incomplete."""
+        frame = bytes(frame)
+        if len(frame) != FRAME_LENGTH:
+            raise ProtocolError(f"frame length {len(frame)}")
+        if checksum(frame[:19]) != frame[19]:
+            raise ProtocolError(f"bad checksum in {frame.hex()}")
+
+        if frame[0] == SINGLE_PACKET:
+            if self._expected is not None:
+                raise ProtocolError("single packet inside a multi packet sequence")
+            return self._single(frame[1], frame[2:19])
+        if frame[0] == MULTI_PACKET:
+            return self._multi_packet(frame)
+        raise ProtocolError(f"unknown frame type {frame[0]:#x}")
+
+    @staticmethod
+    def _single(cmd: int, payload: bytes) -> dict:
+        if cmd == CMD_POWER:
+            return {"is_on": payload[0] == 1}
+        if cmd == CMD_BRIGHTNESS:
+            return {"brightness": payload[0]}
+        if cmd == CMD_COLOR:
+            if payload[0] == MODE_MANUAL:
+                return {"rgb_color": tuple(payload[1:4]), "scene": None}
+            if payload[0] == MODE_SEGMENTS:
+                return {"rgb_color": tuple(payload[2:5]), "scene": None}
+            raise ProtocolError(f"unknown color mode {payload[0]:#x}")
+        raise ProtocolError(f"unknown command {cmd:#x}")
+
+    def _multi_packet(self, frame: bytes) -> dict | None:
+        index = frame[1]
+        if self._expected is None:
+            if index != 0 or frame[2] != 1:
+                raise ProtocolError(f"multi packet sequence starts with index {index}")
+            self._expected = frame[3]
+            self._next_index = 1
+            self._multi = [frame]
+            return None
+
+        if index == LAST_PACKET_INDEX:
+            self._multi.append(frame)
+            received, expected = len(self._multi), self._expected
+            packets, self._multi, self._expected = self._multi, [], None
+            if received != expected:
+                raise ProtocolError(f"multi packet sequence has {received} packets, head announced {expected}")
+            return {"scene": b"".join(packet[2:19] for packet in packets).hex()}
+
+        if index != self._next_index:
+            raise ProtocolError(f"multi packet index {index}, expected {self._next_index}")
+        self._next_index += 1
+        self._multi.append(frame)
+        return None